@@ -1,12 +1,12 @@
 """Decorator library."""
 
 import functools
-import inspect
 from typing import Callable
 
 from ._batch import batch
 from ._limit_jobs import TooManyCalls, limit_jobs
 from ._retry import retry
+from ._utils import is_coroutine_function
 
 
 def wrap_in_coroutine(func: Callable) -> Callable:
@@ -20,7 +20,7 @@ def wrap_in_coroutine(func: Callable) -> Callable:
     Returns:
         A coroutine function which executes `func`.
     """
-    if inspect.iscoroutinefunction(func):
+    if is_coroutine_function(func):
         return func
 
     @functools.wraps(func)
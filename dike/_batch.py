@@ -1,9 +1,9 @@
 """Implementation of the @dike.batch decorator."""
 
 import asyncio
+import collections
 import functools
-from contextlib import contextmanager
-from typing import Any, Callable, Coroutine, Dict, List, Tuple, Union
+from typing import Any, Callable, Coroutine, Deque, Dict, FrozenSet, List, Optional, Tuple
 
 try:
     import numpy as np  # type: ignore
@@ -11,6 +11,29 @@ except ImportError:
     np = None
 
 
+class _BatchState:
+    """Result or exception of one batch with the event and the reference count of its callers.
+
+    The event is only created once a caller actually has to wait for the result.
+    """
+
+    __slots__ = ("event", "exception", "n_callers", "result")
+
+    def __init__(self):
+        self.event: Optional[asyncio.Event] = None
+        self.result: Optional[List] = None
+        self.exception: Optional[Exception] = None
+        self.n_callers: int = 0
+
+
+def _concatenate_lists(lists: List[List]) -> List:
+    """Concatenate the given lists into a new list."""
+    concatenated: List = []
+    for lst in lists:
+        concatenated.extend(lst)
+    return concatenated
+
+
 # Deactivate mccabe's complexity warnings which doesn't like closures
 def batch(  # noqa: PLR0915, C901
     *,
@@ -64,6 +87,12 @@ def batch(  # noqa: PLR0915, C901
         the same keyword arguments. It also isn't possible to mix the two ways to pass an argument.
         The same argument always has to be passed either as keyword argument or as positional
         argument.
+    - The decorator doesn't spawn tasks of its own. The caller which completes a batch awaits
+        the wrapped function directly, so on Python >= 3.12 an event loop configured with
+        `loop.set_task_factory(asyncio.eager_task_factory)` can run short batches without an
+        extra scheduling round-trip.
+    - Waiting for a batch to fill up is based on asyncio timers. For low latency batching
+        consider running the event loop with uvloop, which implements timers in C.
 
     Example:
         >>> import asyncio
@@ -102,57 +131,62 @@ def batch(  # noqa: PLR0915, C901
         )
     if argument_type == "numpy" and np is None:
         raise ValueError('Unable to use "numpy" as argument_type because numpy is not available')
+    concatenate = np.concatenate if argument_type == "numpy" else _concatenate_lists
 
     def decorator(func):  # noqa: C901, PLR0915
         next_free_batch: int = 0
-        call_args_queue: List[Tuple[List, Dict]] = []
+        call_args_queue: Deque[Tuple[Tuple, Dict]] = collections.deque()
         n_rows_in_queue: int = 0
-        result_ready_events: Dict[int, asyncio.Event] = {}
-        results: Dict[int, Union[Exception, List]] = {}
-        num_results_ready: Dict[int, int] = {}
+        # Signature shared by all calls in the queue, taken from the first call of a batch
+        n_positional_args: int = 0
+        kwarg_names: Tuple[str, ...] = ()  # In the order of the first call
+        kwarg_name_set: FrozenSet[str] = frozenset()  # For the consistency check
+        batches: Dict[int, _BatchState] = {}
 
         @functools.wraps(func)
         async def batching_call(*args, **kwargs):
             """This is the actual wrapper function which controls the process."""
-            nonlocal \
-                results, \
-                num_results_ready, \
-                result_ready_events, \
-                call_args_queue, \
-                n_rows_in_queue
-
-            with enqueue(args, kwargs) as (my_batch_no, start_index, stop_index):
-                await wait_for_calculation(my_batch_no)
-                return get_results(start_index, stop_index, my_batch_no)
-
-        @contextmanager
-        def enqueue(args, kwargs) -> (int, int, int):
-            """Add call arguments to queue and get the batch number and result indices."""
+            nonlocal batches, call_args_queue, n_rows_in_queue
+
+            # Enqueue the call arguments and register as caller of the current batch
             batch_no = next_free_batch
-            if batch_no not in result_ready_events:
-                result_ready_events[batch_no] = asyncio.Event()
             start_index, stop_index = add_args_to_queue(args, kwargs)
+            state = batches.get(batch_no)
+            if state is None:
+                state = batches[batch_no] = _BatchState()
+            state.n_callers += 1
             try:
-                yield batch_no, start_index, stop_index
+                await wait_for_calculation(batch_no, state)
+                if state.exception is not None:
+                    raise state.exception
+                return state.result[start_index:stop_index]  # type: ignore
             finally:
-                remove_result(batch_no)
+                # The last caller of a batch removes its result from the buffer
+                state.n_callers -= 1
+                if not state.n_callers:
+                    del batches[batch_no]
 
         def add_args_to_queue(args, kwargs):
             """Add a new argument vector to the queue and return result indices."""
-            nonlocal call_args_queue, n_rows_in_queue
-
-            if call_args_queue and (
-                len(args) != len(call_args_queue[0][0])
-                or kwargs.keys() != call_args_queue[0][1].keys()
-            ):
-                raise ValueError("Inconsistent use of positional and keyword arguments")
-            n_rows_call = 0
+            nonlocal n_rows_in_queue, n_positional_args, kwarg_names, kwarg_name_set
+
+            if call_args_queue:
+                # Calls with positional arguments only don't need to compare any dict keys
+                if len(args) != n_positional_args or (
+                    (kwargs or kwarg_names) and kwargs.keys() != kwarg_name_set
+                ):
+                    raise ValueError("Inconsistent use of positional and keyword arguments")
+            else:
+                n_positional_args = len(args)
+                kwarg_names = tuple(kwargs)
+                kwarg_name_set = frozenset(kwarg_names)
             if args:
                 n_rows_call = len(args[0])
             elif kwargs:
-                for v in kwargs.values():
-                    n_rows_call = len(v)
-                    break  # We only need one arbitrary keyword argument
+                # We only need one arbitrary keyword argument
+                n_rows_call = len(next(iter(kwargs.values())))
+            else:
+                n_rows_call = 0
             if n_rows_call == 0:
                 raise ValueError("Function called with empty collections as arguments")
             call_args_queue.append((args, kwargs))
@@ -160,87 +194,53 @@ def batch(  # noqa: PLR0915, C901
             n_rows_in_queue += n_rows_call
             return offset, n_rows_in_queue
 
-        async def wait_for_calculation(batch_no_to_calculate):
+        async def wait_for_calculation(batch_no_to_calculate, state):
             """Pause until the result becomes available or trigger the calculation on timeout."""
             if n_rows_in_queue >= target_batch_size:
-                await calculate(batch_no_to_calculate)
+                await calculate(batch_no_to_calculate, state)
             else:
+                if state.event is None:
+                    state.event = asyncio.Event()
+                event = state.event
                 try:
-                    await asyncio.wait_for(
-                        result_ready_events[batch_no_to_calculate].wait(), timeout=max_waiting_time
-                    )
+                    await asyncio.wait_for(event.wait(), timeout=max_waiting_time)
                 except asyncio.TimeoutError:
                     if next_free_batch == batch_no_to_calculate:
-                        await calculate(batch_no_to_calculate)
-                    else:
-                        await asyncio.wait_for(
-                            result_ready_events[batch_no_to_calculate].wait(),
-                            timeout=max_processing_time,
-                        )
-
-        async def calculate(batch_no_to_calculate):
-            """Call the decorated coroutine with batched arguments."""
-            nonlocal results, call_args_queue, num_results_ready
+                        await calculate(batch_no_to_calculate, state)
+                    elif not event.is_set():
+                        # Another call is already calculating this batch. Only arm a new timer
+                        # if its result didn't arrive together with our timeout.
+                        await asyncio.wait_for(event.wait(), timeout=max_processing_time)
+
+        async def calculate(batch_no_to_calculate, state):
+            """Call the decorated coroutine with batched arguments and store the result in state."""
             if next_free_batch == batch_no_to_calculate:
-                n_results = len(call_args_queue)
                 args, kwargs = pop_args_from_queue()
                 try:
-                    results[batch_no_to_calculate] = await func(*args, **kwargs)
+                    state.result = await func(*args, **kwargs)
                 except Exception as e:  # pylint: disable=broad-except  # noqa: BLE001
-                    results[batch_no_to_calculate] = e
-                num_results_ready[batch_no_to_calculate] = n_results
-                result_ready_events[batch_no_to_calculate].set()
+                    state.exception = e
+                if state.event is not None:
+                    state.event.set()
 
         def pop_args_from_queue():
             """Get all collected arguments from the queue as batch."""
-            nonlocal next_free_batch, call_args_queue, n_rows_in_queue
-
-            n_args = len(call_args_queue[0][0])
-            args = []
-            for j in range(n_args):
-                if argument_type == "list":
-                    args.append(
-                        [element for call_args, _ in call_args_queue for element in call_args[j]]
-                    )
-                elif argument_type == "numpy":
-                    args.append(np.concatenate([call_args[j] for call_args, _ in call_args_queue]))
-            kwargs = {}
-            for k in call_args_queue[0][1].keys():
-                if argument_type == "list":
-                    kwargs[k] = [
-                        element for _, call_kwargs in call_args_queue for element in call_kwargs[k]
-                    ]
-                elif argument_type == "numpy":
-                    kwargs[k] = np.concatenate(
-                        [call_kwargs[k] for _, call_kwargs in call_args_queue]
-                    )
-
-            call_args_queue = []
+            nonlocal next_free_batch, n_rows_in_queue
+
+            queue = call_args_queue
+            args = [
+                concatenate([call_args[j] for call_args, _ in queue])
+                for j in range(n_positional_args)
+            ]
+            kwargs = {
+                k: concatenate([call_kwargs[k] for _, call_kwargs in queue]) for k in kwarg_names
+            }
+
+            queue.clear()
             n_rows_in_queue = 0
             next_free_batch += 1
             return args, kwargs
 
-        def get_results(start_index: int, stop_index: int, batch_no):
-            """Pop the results for a certain index range from the output buffer."""
-            nonlocal results
-
-            if isinstance(results[batch_no], Exception):
-                exc = results[batch_no]
-                raise exc  # type: ignore
-            results_to_return = results[batch_no][start_index:stop_index]  # type: ignore
-            return results_to_return
-
-        def remove_result(batch_no):
-            """Reduce reference count to output buffer and eventually delete it."""
-            nonlocal num_results_ready, result_ready_events, results
-
-            if num_results_ready[batch_no] == 1:
-                del result_ready_events[batch_no]
-                del results[batch_no]
-                del num_results_ready[batch_no]
-            else:
-                num_results_ready[batch_no] -= 1
-
         return batching_call
 
     return decorator
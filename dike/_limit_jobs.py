@@ -1,9 +1,10 @@
 """Implementation of the @dike.limit_jobs decorator."""
 
 import functools
-import inspect
 from typing import Any, Callable, Coroutine
 
+from ._utils import is_coroutine_function
+
 
 class TooManyCalls(Exception):  # noqa: N818
     """Error raised by @limit_jobs when a call exceeds the preset limit."""
@@ -63,16 +64,16 @@ def limit_jobs(*, limit: int) -> Callable[..., Coroutine[Any, Any, Any]]:
     counter = limit
 
     def decorator(func):
-        if not inspect.iscoroutinefunction(func):
+        if not is_coroutine_function(func):
             raise ValueError(f"Error when wrapping {func!s}. Only coroutines can be wrapped!")
 
+        error_message = f"Too many calls to function {func.__name__}! limit={limit} exceeded"
+
         @functools.wraps(func)
         async def limited_call(*args, **kwargs):
             nonlocal counter
             if counter == 0:
-                raise TooManyCalls(
-                    f"Too many calls to function {func.__name__}! limit={limit} exceeded"
-                )
+                raise TooManyCalls(error_message)
             try:
                 counter -= 1
                 return await func(*args, **kwargs)
@@ -3,19 +3,27 @@
 import asyncio
 import datetime
 import functools
-import inspect
 import logging
+import math
+import random
+import time
 from typing import Awaitable, Callable, Optional, Tuple, Type, Union
 
+from ._utils import is_coroutine_function
+
 logger = logging.getLogger("dike")
 
 
-def retry(
+# Deactivate mccabe's complexity warnings which doesn't like closures
+def retry(  # noqa: C901
     *,
     attempts: Optional[int] = None,
     exception_types: Union[Type[BaseException], Tuple[Type[BaseException]]] = Exception,
     delay: Optional[datetime.timedelta] = None,
     backoff: int = 1,
+    max_delay: Optional[datetime.timedelta] = None,
+    jitter: float = 0.0,
+    min_retry_interval: Optional[datetime.timedelta] = None,
     log_exception_info: bool = True,
 ) -> Callable[[Callable[..., Awaitable]], Callable[..., Awaitable]]:
     """Decorator to limit the number of concurrent calls to a coroutine function. Not thread-safe.
@@ -29,6 +37,16 @@ def retry(
         backoff: Multiplier applied to the delay between attempts. Per default this is `1`, so that
             the delay is constant and does not grow. E.g. use `2` to double the delay with each
             attempt.
+        max_delay: Upper bound for the delay between attempts when it grows with `backoff`. It
+            also caps the delay after `jitter` is applied. Per default the delay is not capped.
+        jitter: Random variation of each delay as a fraction between `0` and `1`. E.g. `0.1`
+            sleeps between 90% and 110% of the delay. This spreads out the retries of many callers
+            which failed at the same time. Per default the delay is exact.
+        min_retry_interval: Minimum time between any two retries of the decorated function, across
+            all concurrent calls. After its regular delay a retry waits for the next free slot of
+            the function. If many calls fail at once, their retries are spread out so that the
+            backend is not hit by a burst of retries. The delay in the log message of a failed
+            attempt doesn't include this extra wait. Per default retries are not paced.
         log_exception_info: Wether to include the exception stacktrace when logging any failed
             attempts. Default: True
 
@@ -68,15 +86,31 @@ def retry(
     """
     if attempts and not attempts >= 0:
         raise ValueError("Error when wrapping f(). max_attempts must be >= 0!")
+    if max_delay is not None and max_delay < datetime.timedelta(0):
+        raise ValueError("Error when wrapping f(). max_delay must be >= 0!")
+    if max_delay is not None and delay is not None and max_delay < delay:
+        raise ValueError("Error when wrapping f(). max_delay must be >= delay!")
+    if not 0 <= jitter <= 1:
+        raise ValueError("Error when wrapping f(). jitter must be between 0 and 1!")
+    if min_retry_interval is not None and min_retry_interval < datetime.timedelta(0):
+        raise ValueError("Error when wrapping f(). min_retry_interval must be >= 0!")
+    min_retry_interval_seconds = (
+        0 if min_retry_interval is None else min_retry_interval.total_seconds()
+    )
+    max_delay_seconds = math.inf if max_delay is None else max_delay.total_seconds()
+    initial_counter = -1 if attempts is None else attempts
+    initial_delay = 0 if delay is None else delay.total_seconds()
 
     def decorator(func: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
-        if not inspect.iscoroutinefunction(func):
+        if not is_coroutine_function(func):
             raise ValueError(f"Error when wrapping {func!s}. Only coroutines can be wrapped!")
+        next_retry_time = -math.inf
 
         @functools.wraps(func)
         async def guarded_call(*args, **kwargs):
-            counter = -1 if attempts is None else attempts
-            next_delay = 0 if delay is None else delay.total_seconds()
+            nonlocal next_retry_time
+            counter = initial_counter
+            next_delay = initial_delay
 
             while counter:
                 try:
@@ -86,12 +120,26 @@ def retry(
                     counter -= 1
                     if not counter:
                         raise
+                    sleep_time = next_delay
+                    if jitter:
+                        sleep_time *= 1 + jitter * (2 * random.random() - 1)
+                        sleep_time = min(sleep_time, max_delay_seconds)
                     logger.warning(
-                        f"Caught exception {e!r}. Retrying in {next_delay:.3g}s ...",
+                        "Caught exception %r. Retrying in %.3gs ...",
+                        e,
+                        sleep_time,
                         exc_info=log_exception_info,
                     )
-                    await asyncio.sleep(next_delay)
-                    next_delay *= backoff
+                    await asyncio.sleep(sleep_time)
+                    if min_retry_interval_seconds:
+                        # Reserve the next free retry slot of this function. This happens only
+                        # after the own delay, so a long backoff can't hold back other calls.
+                        now = time.monotonic()
+                        retry_time = max(now, next_retry_time)
+                        next_retry_time = retry_time + min_retry_interval_seconds
+                        if retry_time > now:
+                            await asyncio.sleep(retry_time - now)
+                    next_delay = min(next_delay * backoff, max_delay_seconds)
 
         return guarded_call
 
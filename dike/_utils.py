@@ -0,0 +1,23 @@
+"""Internal helpers shared by the decorators."""
+
+import inspect
+from typing import Callable
+
+
+def is_coroutine_function(func: Callable) -> bool:
+    """Check if `func` is a coroutine function.
+
+    `async def` functions and bound methods of them are recognized directly from the flags of
+    their code object. Only partials and callables marked with `inspect.markcoroutinefunction`
+    are left to `inspect.iscoroutinefunction`.
+
+    Args:
+        func: The callable object to check
+
+    Returns:
+        True if calling `func` returns a coroutine, False otherwise.
+    """
+    code = getattr(func, "__code__", None)
+    if code is not None and code.co_flags & inspect.CO_COROUTINE:
+        return True
+    return inspect.iscoroutinefunction(func)
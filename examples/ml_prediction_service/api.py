@@ -1,6 +1,6 @@
 """Minimal example API using dike for microbatching.
 
-Dependencies: fastapi, uvicorn
+Dependencies: fastapi, uvicorn, numpy, numba
 Run with: python api.py
 
 Simple load test with github.com/codesenberg/bombardier:
@@ -10,9 +10,10 @@ Simple load test with github.com/codesenberg/bombardier:
 
 import asyncio
 import concurrent
-import random
+import math
 from typing import List
 
+import numba
 import numpy as np
 from fastapi import FastAPI, Response
 
@@ -21,12 +22,25 @@ import dike
 app = FastAPI()
 
 
+# Compiled eagerly for the given signature at import time. The machine code is cached on disk, so
+# restarts of the service don't pay the compilation time again.
+@numba.njit("void(float32[:], float32[:])", parallel=True, fastmath=True, nogil=True, cache=True)
+def _predict_kernel(arr, rs):
+    """Apply the dummy recurrence to every element of arr in place, elements in parallel."""
+    for i in numba.prange(arr.shape[0]):
+        x = arr[i]
+        for k in range(rs.shape[0]):
+            x = math.sqrt(x + rs[k])
+        arr[i] = x
+
+
 def predict(numbers: List[float]):
     """Dummy machine learning operation."""
-    arr = np.array(numbers)
-    for _ in range(10000):
-        arr = np.sqrt(arr + random.random() * 2)
-    return list(arr)
+    # Single precision is plenty for this model and halves the memory traffic
+    arr = np.array(numbers, dtype=np.float32)
+    rs = np.random.default_rng().random(10000, dtype=np.float32) * 2
+    _predict_kernel(arr, rs)
+    return arr.tolist()
 
 
 @dike.limit_jobs(limit=20)
@@ -39,7 +53,11 @@ async def predict_in_pool(numbers: List[float]):
 
 @app.on_event("startup")
 async def on_startup():  # noqa: D103
-    app.state.pool = concurrent.futures.ProcessPoolExecutor(max_workers=2)
+    # The kernel releases the GIL and parallelizes over the batch by itself, so a single
+    # persistent thread is enough and the arguments don't have to be pickled for a subprocess.
+    app.state.pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    # Start Numba's parallel runtime before the first request comes in
+    await asyncio.get_running_loop().run_in_executor(app.state.pool, predict, [0.0])
 
 
 @app.get("/predict")
@@ -19,10 +19,6 @@ def exceptions_equal(exception1, exception2):
     return (type(exception1) is type(exception2)) and str(exception1) == str(exception2)
 
 
-async def raise_error(message):
-    raise RuntimeError(message)
-
-
 @pytest.mark.parametrize(
     ("argtype_converter", "arg_type_name"), [(list, "list"), (np.array, "numpy")]
 )
@@ -114,6 +110,33 @@ def test_single_items_mixed_kwargs_raises_value_error(argtype_converter, arg_typ
     asyncio.run(run_test())
 
 
+@pytest.mark.parametrize(
+    ("first_kwargs", "second_kwargs"),
+    [({}, {"extra": [1]}), ({"arg2": ["a"]}, {"arg2": ["b"], "extra": [1]}), ({"arg2": ["a"]}, {})],
+    ids=["keyword_added", "further_keyword_added", "keyword_dropped"],
+)
+def test_inconsistent_kwargs_with_same_positional_args_raise_value_error(
+    first_kwargs, second_kwargs
+):
+    @dike.batch(target_batch_size=2, max_waiting_time=0.01)
+    async def f(arg1, arg2=None, extra=None):
+        assert arg1 == [0]
+        return [10]
+
+    async def run_test():
+        result = await asyncio.wait_for(
+            asyncio.gather(f([0], **first_kwargs), f([1], **second_kwargs), return_exceptions=True),
+            timeout=1.0,
+        )
+
+        assert result[0] == [10]
+        assert exceptions_equal(
+            result[1], ValueError("Inconsistent use of positional and keyword arguments")
+        )
+
+    asyncio.run(run_test())
+
+
 def test_single_items_timeout():
     @dike.batch(target_batch_size=10, max_waiting_time=0.01)
     async def f(arg1, arg2):
@@ -134,43 +157,31 @@ def test_single_items_timeout():
     asyncio.run(run_test())
 
 
-def test_multi_batch_size_reached():
-    @dike.batch(target_batch_size=5, max_waiting_time=2)
+@pytest.mark.parametrize(
+    ("target_batch_size", "max_waiting_time", "use_kwargs", "timeout"),
+    [(5, 2, False, 0.1), (5, 2, True, 0.1), (10, 0.01, False, 0.2)],
+    ids=["batch_size_reached", "args_and_kwargs_batch_size_reached", "timeout"],
+)
+def test_multi_items(target_batch_size, max_waiting_time, use_kwargs, timeout):
+    @dike.batch(target_batch_size=target_batch_size, max_waiting_time=max_waiting_time)
     async def f(arg1, arg2):
         assert arg1 == [0, 1, 2, 3, 4]
         assert arg2 == ["a", "b", "c", "d", "e"]
         return [10, 11, 12, 13, 14]
 
-    async def run_test():
-        result = await asyncio.wait_for(
-            asyncio.gather(
-                f([0], ["a"]),
-                f([1, 2, 3], ["b", "c", "d"]),
-                f([4], ["e"]),
-            ),
-            timeout=0.1,
-        )
-
-        assert result == [[10], [11, 12, 13], [14]]
-
-    asyncio.run(run_test())
-
-
-def test_multi_args_and_kwargs_batch_size_reached():
-    @dike.batch(target_batch_size=5, max_waiting_time=2)
-    async def f(arg1, arg2):
-        assert arg1 == [0, 1, 2, 3, 4]
-        assert arg2 == ["a", "b", "c", "d", "e"]
-        return [10, 11, 12, 13, 14]
+    async def call(arg1, arg2):
+        if use_kwargs:
+            return await f(arg1, arg2=arg2)
+        return await f(arg1, arg2)
 
     async def run_test():
         result = await asyncio.wait_for(
             asyncio.gather(
-                f([0], arg2=["a"]),
-                f([1, 2, 3], arg2=["b", "c", "d"]),
-                f([4], arg2=["e"]),
+                call([0], ["a"]),
+                call([1, 2, 3], ["b", "c", "d"]),
+                call([4], ["e"]),
             ),
-            timeout=0.1,
+            timeout=timeout,
         )
 
         assert result == [[10], [11, 12, 13], [14]]
@@ -178,24 +189,25 @@ def test_multi_args_and_kwargs_batch_size_reached():
     asyncio.run(run_test())
 
 
-def test_multi_item_timeout():
-    @dike.batch(target_batch_size=10, max_waiting_time=0.01)
-    async def f(arg1, arg2):
-        assert arg1 == [0, 1, 2, 3, 4]
-        assert arg2 == ["a", "b", "c", "d", "e"]
-        return [10, 11, 12, 13, 14]
+def test_kwargs_are_passed_in_call_order():
+    received_names = []
+
+    @dike.batch(target_batch_size=2, max_waiting_time=10)
+    async def f(**kwargs):
+        received_names.extend(kwargs)
+        return [10, 11]
 
     async def run_test():
         result = await asyncio.wait_for(
             asyncio.gather(
-                f([0], ["a"]),
-                f([1, 2, 3], ["b", "c", "d"]),
-                f([4], ["e"]),
+                f(z=[0], a=[1], m=[2], b=[3]),
+                f(a=[5], b=[7], z=[4], m=[6]),
             ),
-            timeout=0.2,
+            timeout=1.0,
         )
 
-        assert result == [[10], [11, 12, 13], [14]]
+        assert result == [[10], [11]]
+        assert received_names == ["z", "a", "m", "b"]
 
     asyncio.run(run_test())
 
@@ -319,28 +331,19 @@ def test_no_numpy_available(monkeypatch):
 @pytest.mark.parametrize("batch_size", [0, -1, float("-inf")])
 def test_illegal_batch_size_leads_to_value_error(batch_size):
     with pytest.raises(ValueError):
-
-        @dike.batch(target_batch_size=batch_size, max_waiting_time=1)
-        async def f(_):
-            pass
+        dike.batch(target_batch_size=batch_size, max_waiting_time=1)
 
 
 @pytest.mark.parametrize("waiting_time", [0, -1, float("-inf")])
 def test_illegal_waiting_time_leads_to_value_error(waiting_time):
     with pytest.raises(ValueError):
-
-        @dike.batch(target_batch_size=1, max_waiting_time=waiting_time)
-        async def f(_):
-            pass
+        dike.batch(target_batch_size=1, max_waiting_time=waiting_time)
 
 
 @pytest.mark.parametrize("argument_type", ["", "unknown"])
 def test_illegal_argument_type_leads_to_value_error(argument_type):
     with pytest.raises(ValueError):
-
-        @dike.batch(target_batch_size=1, max_waiting_time=1, argument_type=argument_type)
-        async def f(_):
-            pass
+        dike.batch(target_batch_size=1, max_waiting_time=1, argument_type=argument_type)
 
 
 def test_internal_storage_is_cleaned():
@@ -357,9 +360,7 @@ def test_internal_storage_is_cleaned():
 
         # Check if the internal dictionaries are empty (there are no other batches here)
         closure_vars = inspect.getclosurevars(f).nonlocals
-        assert not closure_vars["results"]
-        assert not closure_vars["num_results_ready"]
-        assert not closure_vars["result_ready_events"]
+        assert not closure_vars["batches"]
         assert not closure_vars["call_args_queue"]
         assert not closure_vars["n_rows_in_queue"]
 
@@ -379,13 +380,33 @@ def test_internal_storage_is_cleaned_also_when_cancelled():
         task1.cancel()
         result2 = await task2
         result3 = await task3
-        assert result2, result3 == ([11], [12])
+        assert (result2, result3) == ([11], [12])
 
         # Check if the internal dictionaries are empty (there are no other batches here)
         closure_vars = inspect.getclosurevars(f).nonlocals
-        assert not closure_vars["results"]
-        assert not closure_vars["num_results_ready"]
-        assert not closure_vars["result_ready_events"]
+        assert not closure_vars["batches"]
+        assert not closure_vars["call_args_queue"]
+        assert not closure_vars["n_rows_in_queue"]
+
+    asyncio.run(run_test())
+
+
+def test_internal_storage_is_cleaned_when_cancelled_before_calculation():
+    @dike.batch(target_batch_size=3, max_waiting_time=0.01)
+    async def f(*_):
+        return [10, 11]
+
+    async def run_test():
+        task1 = asyncio.create_task(f([0]))
+        task2 = asyncio.create_task(f([0]))
+        await asyncio.sleep(0)
+        task1.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task1
+        assert await task2 == [11]
+
+        closure_vars = inspect.getclosurevars(f).nonlocals
+        assert not closure_vars["batches"]
         assert not closure_vars["call_args_queue"]
         assert not closure_vars["n_rows_in_queue"]
 
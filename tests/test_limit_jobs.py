@@ -10,6 +10,7 @@ import pytest
 import dike
 
 concurrency_limit = parametrized.fixture(3, 1, 0, -1, 1.5)
+illegal_limit_message = re.compile(re.escape("Error when wrapping f(). Limit must be >= 0"))
 
 
 @dike.limit_jobs(limit=2)
@@ -91,7 +92,7 @@ def test_call_with_limit_0():
 @pytest.mark.parametrize("job_limit", [-1, -1.5, float("-inf")])
 def test_unlogical_limits_give_clear_error(job_limit):
     """Ensure that a proper error message is shown when trying to set strange limits."""
-    with pytest.raises(ValueError, match=re.escape("Error when wrapping f(). Limit must be >= 0")):
+    with pytest.raises(ValueError, match=illegal_limit_message):
 
         @dike.limit_jobs(limit=job_limit)
         async def f():
@@ -1,11 +1,25 @@
 import asyncio
+import collections
 import datetime
+import time
 
 import pytest
 
 import dike
 
 
+@pytest.fixture
+def recorded_sleeps(monkeypatch):
+    """Replace asyncio.sleep by a stub which returns at once and records the sleep times."""
+    sleeps = []
+
+    async def sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    return sleeps
+
+
 @pytest.mark.parametrize("attempts", [None, 1, 2, 3, 2.5, float("inf")])
 def test_no_exception(attempts):
     """No exception."""
@@ -50,9 +64,8 @@ def test_exception_with_retry_failed(attempts, caplog):
     with pytest.raises(ValueError):
         print(asyncio.run(f()))
     assert i == 2 - attempts
-    assert caplog.messages == [
-        "Caught exception ValueError('failure'). Retrying in 0s ..." for _ in range(attempts - 1)
-    ]
+    message = "Caught exception ValueError('failure'). Retrying in 0s ..."
+    assert tuple(caplog.messages) == (message,) * (attempts - 1)
 
 
 @pytest.mark.parametrize(
@@ -68,12 +81,10 @@ def test_exception_with_retry_failed(attempts, caplog):
 def test_sleep_time(delay, backoff, monkeypatch):
     """Running over the maximum number of attempts."""
     n_calls = 0
+    delay_seconds = delay.total_seconds() if delay else 0
 
     async def sleep(seconds):
-        if not delay:
-            assert seconds == 0
-        else:
-            assert seconds == delay.total_seconds() * backoff ** (n_calls - 1)
+        assert seconds == delay_seconds * backoff ** (n_calls - 1)
 
     monkeypatch.setattr(asyncio, "sleep", sleep)
 
@@ -86,3 +97,193 @@ def test_sleep_time(delay, backoff, monkeypatch):
     with pytest.raises(ValueError):
         asyncio.run(f())
     assert n_calls == 3
+
+
+@pytest.mark.parametrize(
+    ("max_delay", "expected_delays"),
+    [
+        (None, [1.0, 2.0, 4.0, 8.0]),
+        (datetime.timedelta(seconds=3), [1.0, 2.0, 3.0, 3.0]),
+        (datetime.timedelta(seconds=1), [1.0, 1.0, 1.0, 1.0]),
+    ],
+)
+def test_max_delay(max_delay, expected_delays, recorded_sleeps):
+    """The growing delay is capped at max_delay."""
+
+    @dike.retry(
+        attempts=5,
+        exception_types=ValueError,
+        delay=datetime.timedelta(seconds=1),
+        backoff=2,
+        max_delay=max_delay,
+    )
+    async def f():
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        asyncio.run(f())
+    assert recorded_sleeps == expected_delays
+
+
+@pytest.mark.parametrize(
+    ("delay", "max_delay", "message"),
+    [
+        (
+            datetime.timedelta(seconds=2),
+            datetime.timedelta(seconds=1),
+            "max_delay must be >= delay",
+        ),
+        (None, datetime.timedelta(seconds=-1), "max_delay must be >= 0"),
+    ],
+)
+def test_illegal_max_delay_gives_clear_error(delay, max_delay, message):
+    """A max_delay below the initial delay or below zero is a configuration error."""
+    with pytest.raises(ValueError, match=message):
+
+        @dike.retry(attempts=3, delay=delay, max_delay=max_delay)
+        async def f():
+            pass
+
+
+@pytest.mark.parametrize("jitter", [0.1, 0.5, 1])
+def test_jitter(jitter, recorded_sleeps):
+    """The delays vary randomly within the jitter range around the regular delay."""
+
+    @dike.retry(
+        attempts=50,
+        exception_types=ValueError,
+        delay=datetime.timedelta(seconds=1),
+        jitter=jitter,
+    )
+    async def f():
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        asyncio.run(f())
+    assert len(recorded_sleeps) == 49
+    assert all(1 - jitter <= d <= 1 + jitter for d in recorded_sleeps)
+    assert len(set(recorded_sleeps)) > 1
+
+
+def test_jitter_does_not_exceed_max_delay(recorded_sleeps):
+    """Jitter varies the delay, but max_delay remains the upper bound."""
+
+    @dike.retry(
+        attempts=50,
+        exception_types=ValueError,
+        delay=datetime.timedelta(seconds=1),
+        backoff=2,
+        max_delay=datetime.timedelta(seconds=2),
+        jitter=0.5,
+    )
+    async def f():
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        asyncio.run(f())
+    assert len(recorded_sleeps) == 49
+    assert all(d <= 2 for d in recorded_sleeps)
+    assert 2 in recorded_sleeps
+
+
+@pytest.mark.parametrize("jitter", [-0.1, 1.5])
+def test_illegal_jitter_gives_clear_error(jitter):
+    """Jitter is a fraction of the delay."""
+    with pytest.raises(ValueError, match="jitter must be between 0 and 1"):
+
+        @dike.retry(jitter=jitter)
+        async def f():
+            pass
+
+
+def test_min_retry_interval():
+    """Retries of concurrently failing calls are spread out by min_retry_interval."""
+    retry_times = []
+    failed_once = set()
+
+    @dike.retry(
+        attempts=2,
+        exception_types=ValueError,
+        min_retry_interval=datetime.timedelta(milliseconds=20),
+    )
+    async def f(call_id):
+        if call_id not in failed_once:
+            failed_once.add(call_id)
+            raise ValueError()
+        retry_times.append(time.monotonic())
+        return call_id
+
+    async def run_test():
+        return await asyncio.wait_for(asyncio.gather(f(0), f(1), f(2)), timeout=1.0)
+
+    assert asyncio.run(run_test()) == [0, 1, 2]
+    assert len(retry_times) == 3
+    assert all(t2 - t1 >= 0.019 for t1, t2 in zip(retry_times, retry_times[1:]))
+
+
+def test_min_retry_interval_does_not_wait_for_future_retries():
+    """A long backoff of one call doesn't hold back the retries of other calls."""
+    calls = collections.Counter()
+
+    @dike.retry(
+        exception_types=ValueError,
+        delay=datetime.timedelta(milliseconds=10),
+        backoff=100,
+        min_retry_interval=datetime.timedelta(milliseconds=10),
+    )
+    async def f(n_failures):
+        calls[n_failures] += 1
+        if calls[n_failures] <= n_failures:
+            raise ValueError()
+        return n_failures
+
+    async def run_test():
+        # The first call fails again after its first retry and then sleeps for one second
+        long_failing_call = asyncio.create_task(f(10))
+        await asyncio.sleep(0.05)
+        assert await asyncio.wait_for(f(1), timeout=0.5) == 1
+        long_failing_call.cancel()
+
+    asyncio.run(run_test())
+
+
+def test_min_retry_interval_sleeps_once_per_retry(monkeypatch):
+    """Pacing many concurrent retries costs a constant number of sleeps per retry."""
+    n_calls = 100
+    n_sleeps = 0
+    real_sleep = asyncio.sleep
+    failed_once = set()
+
+    async def counting_sleep(seconds):
+        nonlocal n_sleeps
+        n_sleeps += 1
+        await real_sleep(seconds)
+
+    monkeypatch.setattr(asyncio, "sleep", counting_sleep)
+
+    @dike.retry(
+        attempts=2,
+        exception_types=ValueError,
+        min_retry_interval=datetime.timedelta(milliseconds=1),
+    )
+    async def f(call_id):
+        if call_id not in failed_once:
+            failed_once.add(call_id)
+            raise ValueError()
+        return call_id
+
+    async def run_test():
+        return await asyncio.gather(*[f(i) for i in range(n_calls)])
+
+    assert asyncio.run(run_test()) == list(range(n_calls))
+    # One sleep for the regular delay and at most one for the pacing of each retry
+    assert n_sleeps <= 2 * n_calls
+
+
+def test_negative_min_retry_interval_gives_clear_error():
+    """A negative min_retry_interval is a configuration error."""
+    with pytest.raises(ValueError, match="min_retry_interval must be >= 0"):
+
+        @dike.retry(min_retry_interval=datetime.timedelta(seconds=-1))
+        async def f():
+            pass
@@ -3,64 +3,27 @@
 # pylint: disable=missing-function-docstring
 import asyncio
 
-from dike import wrap_in_coroutine
-
-
-def test_wrap_function():
-    """Wrap a function without arguments."""
-
-    @wrap_in_coroutine
-    def f():
-        return "X"
-
-    assert asyncio.run(f()) == "X"
-
-
-def test_wrap_function_args():
-    """Wrap a function with positional arguments."""
-
-    @wrap_in_coroutine
-    def f(*args):
-        return args
-
-    assert asyncio.run(f("A", 2)) == ("A", 2)
-
-
-def test_wrap_function_kargs():
-    """Wrap a function with keyword arguments."""
-
-    @wrap_in_coroutine
-    def f(**kwargs):
-        return kwargs
-
-    assert asyncio.run(f(a="A", b=2)) == {"a": "A", "b": 2}
-
-
-def test_wrap_coroutine():
-    """Wrap a coroutine without arguments."""
-
-    @wrap_in_coroutine
-    async def f():
-        return "X"
-
-    assert asyncio.run(f()) == "X"
+import pytest
 
+from dike import wrap_in_coroutine
 
-def test_wrap_coroutine_args():
-    """Wrap a coroutine with positional arguments."""
 
-    @wrap_in_coroutine
-    async def f(*args):
-        return args
+def echo_function(*args, **kwargs):
+    return args, kwargs
 
-    assert asyncio.run(f("A", 2)) == ("A", 2)
 
+async def echo_coroutine(*args, **kwargs):
+    return args, kwargs
 
-def test_wrap_coroutine_kargs():
-    """Wrap a coroutine with keyword arguments."""
 
-    @wrap_in_coroutine
-    async def f(**kwargs):
-        return kwargs
+@pytest.mark.parametrize("func", [echo_function, echo_coroutine], ids=["function", "coroutine"])
+@pytest.mark.parametrize(
+    ("args", "kwargs"),
+    [((), {}), (("A", 2), {}), ((), {"a": "A", "b": 2})],
+    ids=["noargs", "args", "kwargs"],
+)
+def test_wrap(func, args, kwargs):
+    """Wrap a function or coroutine and call it with different arguments."""
+    f = wrap_in_coroutine(func)
 
-    assert asyncio.run(f(a="A", b=2)) == {"a": "A", "b": 2}
+    assert asyncio.run(f(*args, **kwargs)) == (args, kwargs)